@@ -11,10 +11,17 @@ from pybites_quality.core import (
     TYPING_TARGET,
     FileMetrics,
     FunctionMetrics,
+    Hotspots,
     ProjectSummary,
+    SummaryAccumulator,
     analyze_file,
+    analyze_files,
     count_typed_functions,
+    is_test_file,
+    iter_analyze_files,
     main,
+    make_relativizer,
+    parallel_map,
     print_hotspots,
     summarize,
     walk_python_files,
@@ -30,9 +37,17 @@ __all__ = [
     "FileMetrics",
     "FunctionMetrics",
     "ProjectSummary",
+    # Accumulators
+    "SummaryAccumulator",
+    "Hotspots",
     # Functions
     "count_typed_functions",
+    "is_test_file",
     "analyze_file",
+    "analyze_files",
+    "iter_analyze_files",
+    "make_relativizer",
+    "parallel_map",
     "walk_python_files",
     "summarize",
     "print_hotspots",
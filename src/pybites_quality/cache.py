@@ -0,0 +1,193 @@
+"""
+Pybites code quality probe - on-disk result cache.
+
+Stores the per-file analysis results keyed by a hash of the file contents
+plus the versions of the analyzers, so unchanged files are not re-analyzed
+between runs. A second table maps (path, mtime, size) to the content hash so
+files whose stat did not change are not even read. Caching is off until
+`configure` is given a directory.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+from functools import cache
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from decouple import config
+
+DEFAULT_CACHE_DIR = "~/.cache/pybites_quality"
+DB_NAME = "results.db"
+
+# bump when the shape of the cached metrics changes
+CACHE_FORMAT = 5
+# rows kept per table by prune(), the oldest writes are dropped first
+MAX_ENTRIES = 50_000
+
+_cache_dir: Path | None = None
+
+
+def configure(cache_dir: Path | None) -> None:
+    """Enable caching in cache_dir, or disable it with None."""
+    global _cache_dir
+    _cache_dir = cache_dir.expanduser() if cache_dir is not None else None
+
+
+def default_dir() -> Path:
+    """Return the cache directory set by PYBITES_QUALITY_CACHE_DIR, or the default."""
+    return Path(
+        config("PYBITES_QUALITY_CACHE_DIR", default=DEFAULT_CACHE_DIR, cast=str)
+    )
+
+
+def cache_dir() -> Path | None:
+    return _cache_dir
+
+
+def enabled() -> bool:
+    return _cache_dir is not None
+
+
+@cache
+def _tool_versions() -> str:
+    # the interpreter decides what parses (and the AST radon sees), so a
+    # result from one Python version must not be reused under another
+    return (
+        f"{CACHE_FORMAT}:{sys.implementation.cache_tag}:"
+        f"{version('radon')}:{version('complexipy')}"
+    )
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def result_key(digest: str) -> str:
+    """Return the cache key for a content digest under the current analyzers."""
+    return f"{digest}:{_tool_versions()}"
+
+
+def _connection() -> sqlite3.Connection:
+    assert _cache_dir is not None
+    # sqlite connections must not cross a fork, so keep one per process
+    return _connect(_cache_dir / DB_NAME, os.getpid())
+
+
+@cache
+def _connect(db_path: Path, pid: int) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # the TUI scans in a fresh worker thread each time; sqlite's serialized
+    # threading mode makes sharing the connection between them safe
+    conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS files "
+        "(path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT)"
+    )
+    return conn
+
+
+def load(key: str) -> Any | None:
+    """Return the cached value for key, or None on a miss."""
+    if _cache_dir is None:
+        return None
+    try:
+        row = (
+            _connection()
+            .execute("SELECT value FROM results WHERE key = ?", (key,))
+            .fetchone()
+        )
+    except (OSError, sqlite3.Error):
+        return None
+    if row is None:
+        return None
+    try:
+        return pickle.loads(row[0])
+    except Exception:
+        # stale or corrupt entry, treat as a miss
+        return None
+
+
+def store(key: str, value: Any) -> None:
+    """Save value under key; the cache is best effort so errors are ignored."""
+    if _cache_dir is None:
+        return
+    try:
+        conn = _connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+            )
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def digest_for_stat(path: str, mtime_ns: int, size: int) -> str | None:
+    """Return the content digest recorded for path if its stat is unchanged.
+
+    Lets unchanged files skip reading and hashing altogether.
+    """
+    if _cache_dir is None:
+        return None
+    try:
+        row = (
+            _connection()
+            .execute(
+                "SELECT digest FROM files WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, mtime_ns, size),
+            )
+            .fetchone()
+        )
+    except (OSError, sqlite3.Error):
+        return None
+    return row[0] if row is not None else None
+
+
+def remember_stat(path: str, mtime_ns: int, size: int, digest: str) -> None:
+    if _cache_dir is None:
+        return
+    try:
+        conn = _connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, digest) "
+                "VALUES (?, ?, ?, ?)",
+                (path, mtime_ns, size, digest),
+            )
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def prune(max_entries: int = MAX_ENTRIES) -> None:
+    """Drop results of other analyzer versions and cap both tables.
+
+    Beyond max_entries rows the least recently written ones go, which also
+    clears out paths that were deleted or only scanned once.
+    """
+    if _cache_dir is None:
+        return
+    suffix = f":{_tool_versions()}"
+    try:
+        conn = _connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM results WHERE substr(key, -?) != ?",
+                (len(suffix), suffix),
+            )
+            for table in ("results", "files"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE rowid IN "
+                    f"(SELECT rowid FROM {table} ORDER BY rowid DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (max_entries,),
+                )
+    except (OSError, sqlite3.Error):
+        pass
@@ -12,23 +12,95 @@ import argparse
 import ast
 import heapq
 import json
-from dataclasses import asdict, dataclass
+import operator
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from itertools import chain, islice
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from statistics import mean
+from typing import Callable, Iterable, Iterator, Sized, TypeVar
 
-from complexipy import file_complexity
+from complexipy import code_complexity
 from decouple import config
-from radon.complexity import cc_rank, cc_visit
-from radon.metrics import mi_rank, mi_visit
-from radon.raw import analyze
+from radon.complexity import cc_rank
+from radon.metrics import h_visit_ast, mi_compute, mi_rank
+from radon.raw import Module, analyze
+from radon.visitors import ComplexityVisitor
+
+from pybites_quality import cache
 
 MI_LOW = 40.0
 MI_HIGH = 70.0
 TYPING_TARGET = 80.0
 COGNITIVE_COMPLEXITY_TARGET = 15
 
+T = TypeVar("T")
+
+# below this many files the process pool startup costs more than it saves
+PARALLEL_MIN_FILES = 8
+# tasks per worker in flight at once; sized inputs are split into about that
+# many chunks per worker, lazy ones into PARALLEL_CHUNK_SIZE-file chunks
+PARALLEL_WINDOW = 4
+PARALLEL_CHUNK_SIZE = 16
+# bigger files are nearly always generated or vendored, and dominate parse time
+MAX_FILE_SIZE = 1_000_000
+# checked (lowercased) in the leading comments and module docstring, within
+# the first GENERATED_HEAD bytes of each file
+GENERATED_MARKERS = (b"# generated by", b"do not edit", b"@generated")
+GENERATED_HEAD = 4096
+WALK_THREADS = 16
+
+IGNORE_DIRS = frozenset(
+    {
+        ".git",
+        ".venv",
+        "venv",
+        "env",
+        "site-packages",
+        ".mypy_cache",
+        ".pytest_cache",
+        "__pycache__",
+        "build",
+        "dist",
+        ".tox",
+        "node_modules",
+    }
+)
+
+
+# concrete node types, so the hot loop can use a set lookup / identity checks
+# instead of isinstance walking the MRO for every node
+_STATEMENT_CONTAINERS = frozenset(
+    {*ast.stmt.__subclasses__(), *ast.excepthandler.__subclasses__(), ast.match_case}
+)
+_FunctionDef = ast.FunctionDef
+_AsyncFunctionDef = ast.AsyncFunctionDef
+
+# precomputed cc_rank grades; nearly all CC values fall inside the table
+_CC_RANKS = tuple(cc_rank(i) for i in range(64))
+
+# C-level sort/heap keys, cheaper per call than the equivalent lambdas
+_MI_KEY = operator.attrgetter("mi")
+_CX_KEY = operator.attrgetter("cognitive_complexity")
+
+
+_TESTS_DIR = f"{os.sep}tests{os.sep}"
+
 
-@dataclass
+def is_test_file(path: str) -> bool:
+    """True for files under a tests/ directory; they are left out of most metrics."""
+    return _TESTS_DIR in path
+
+
+@dataclass(slots=True, frozen=True)
 class FileMetrics:
     path: str
     sloc: int
@@ -43,9 +115,14 @@ class FileMetrics:
     typed_functions: int
     cognitive_complexity: int
     max_function_cognitive_complexity: int
+    # derived from path once, instead of substring checks at every use site
+    is_test: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "is_test", is_test_file(self.path))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FunctionMetrics:
     file: str
     name: str
@@ -53,7 +130,7 @@ class FunctionMetrics:
     cognitive_complexity: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProjectSummary:
     root: str
     files_scanned: int
@@ -68,69 +145,242 @@ class ProjectSummary:
     typing_coverage: float
     avg_cognitive_complexity: float
     max_cognitive_complexity: int
-
-
-def count_typed_functions(code: str) -> tuple[int, int]:
-    """Return (total_functions, typed_functions) using AST."""
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
-        return 0, 0
+    # generated, oversized, non-UTF-8 or unparsable files left out of every metric
+    skipped_files: int = 0
+
+
+def _parse(code: str, filename: str = "<unknown>") -> ast.Module:
+    """ast.parse without the Python-level wrapper.
+
+    PyCF_OPTIMIZED_AST is deliberately not used: constant folding would
+    change the Halstead operand counts that feed into MI.
+    """
+    return compile(code, filename, "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+
+
+def _is_typed(node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+    """True if the function has a return annotation or any annotated arg."""
+    # cheapest checks first, each one short-circuits
+    if node.returns is not None:
+        return True
+    args = node.args
+    if args.vararg is not None and args.vararg.annotation is not None:
+        return True
+    if args.kwarg is not None and args.kwarg.annotation is not None:
+        return True
+    # pos-only, regular, kw-only
+    for group in (args.posonlyargs, args.args, args.kwonlyargs):
+        for a in group:
+            if a.annotation is not None:
+                return True
+    return False
+
+
+def count_typed_functions(code: str | ast.AST) -> tuple[int, int]:
+    """Return (total_functions, typed_functions) using AST.
+
+    Accepts either source code or an already parsed tree.
+    """
+    if isinstance(code, ast.AST):
+        tree = code
+    else:
+        try:
+            tree = _parse(code)
+        except SyntaxError:
+            return 0, 0
 
     total = 0
     typed = 0
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+    # defs can only appear in statement lists, so only descend into statements
+    # (plus except handlers / match cases that hold them) and skip expressions
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        stack.extend(
+            child
+            for child in ast.iter_child_nodes(node)
+            if type(child) in _STATEMENT_CONTAINERS
+        )
+        t = type(node)
+        if t is _FunctionDef or t is _AsyncFunctionDef:
             total += 1
+            if _is_typed(node):
+                typed += 1
 
-            args = []
-            # pos-only, regular, kw-only
-            args.extend(node.args.posonlyargs)
-            args.extend(node.args.args)
-            args.extend(node.args.kwonlyargs)
+    return total, typed
 
-            has_arg_anno = any(a.annotation is not None for a in args)
 
-            vararg = node.args.vararg
-            kwarg = node.args.kwarg
-            if vararg is not None and vararg.annotation is not None:
-                has_arg_anno = True
-            if kwarg is not None and kwarg.annotation is not None:
-                has_arg_anno = True
+def _mi_from_ast(tree: ast.AST, raw: Module, total_complexity: int) -> float:
+    """Same as radon's ``mi_visit(code, multi=True)`` without re-parsing."""
+    comment_lines = raw.comments + raw.multi
+    comments = comment_lines / raw.sloc * 100 if raw.sloc else 0
+    return mi_compute(
+        h_visit_ast(tree).total.volume, total_complexity, raw.lloc, comments
+    )
 
-            has_return_anno = node.returns is not None
 
-            if has_arg_anno or has_return_anno:
-                typed += 1
+def _relocate(
+    result: tuple[FileMetrics, list[FunctionMetrics]], path: Path
+) -> tuple[FileMetrics, list[FunctionMetrics]]:
+    """Point a cached result at path (identical files share one entry)."""
+    fm, fns = result
+    p = str(path)
+    if fm.path == p:
+        return result
+    return replace(fm, path=p), [replace(fn, file=p) for fn in fns]
+
+
+def _from_cache(
+    cached: tuple[FileMetrics, list[FunctionMetrics]] | SyntaxError, path: Path
+) -> tuple[FileMetrics, list[FunctionMetrics]]:
+    """Return a cached result for path, re-raising a cached syntax error."""
+    if isinstance(cached, SyntaxError):
+        location = (
+            str(path),
+            cached.lineno,
+            cached.offset,
+            cached.text,
+            cached.end_lineno,
+            cached.end_offset,
+        )
+        raise SyntaxError(cached.msg, location)
+    return _relocate(cached, path)
 
-    return total, typed
+
+def _read_bytes(path: Path) -> bytes:
+    """Read a whole file with raw os calls, skipping the buffered io layers."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # short reads are rare for regular files, but finish the job if needed
+        while len(data) < size and (chunk := os.read(fd, size - len(data))):
+            data += chunk
+    finally:
+        os.close(fd)
+    return data
+
+
+def _file_header(data: bytes) -> bytes:
+    """Return the leading comment lines and module docstring of a file.
+
+    Stops at the first line of code, so markers in later strings or
+    comments ("do not edit this list without ...") don't count.
+    """
+    header: list[bytes] = []
+    closing = b""  # the docstring's closing quotes while inside it
+    seen_docstring = False
+    for line in data[:GENERATED_HEAD].lower().splitlines():
+        stripped = line.strip()
+        if closing:
+            header.append(stripped)
+            if closing in stripped:
+                closing = b""
+            continue
+        if not stripped or stripped.startswith(b"#"):
+            header.append(stripped)
+            continue
+        body = stripped.lstrip(b"rub")
+        if seen_docstring or body[:3] not in (b'"""', b"'''"):
+            break
+        seen_docstring = True
+        rest = body[3:]
+        header.append(rest)
+        if body[:3] not in rest:
+            closing = body[:3]
+    return b"\n".join(header)
+
+
+def is_generated(data: bytes) -> bool:
+    """True if the file's header carries a "generated code" marker."""
+    header = _file_header(data)
+    return any(marker in header for marker in GENERATED_MARKERS)
+
+
+def _blank_file_metrics(path: Path) -> FileMetrics:
+    """Metrics for a whitespace-only file, as radon/complexipy report them."""
+    return FileMetrics(
+        path=str(path),
+        sloc=0,
+        lloc=0,
+        comments=0,
+        complexity_grades={},
+        worst_cc=0,
+        worst_cc_rank="A",
+        mi=100.0,
+        mi_rank="A",
+        total_functions=0,
+        typed_functions=0,
+        cognitive_complexity=0,
+        max_function_cognitive_complexity=0,
+    )
 
 
 def analyze_file(path: Path) -> tuple[FileMetrics, list[FunctionMetrics]] | None:
+    # one string shared by the FileMetrics and all of its FunctionMetrics
+    path_str = str(path)
+    key = None
+    st = path.stat()
+    if st.st_size > MAX_FILE_SIZE:
+        return None
+    if cache.enabled():
+        digest = cache.digest_for_stat(path_str, st.st_mtime_ns, st.st_size)
+        if digest is not None:
+            cached = cache.load(cache.result_key(digest))
+            if cached is not None:
+                return _from_cache(cached, path)
+
+    data = _read_bytes(path)
+    if not data.strip():
+        # empty __init__.py and friends: nothing to tokenize or parse
+        return _blank_file_metrics(path), []
+    if is_generated(data):
+        return None
     try:
-        code = path.read_text(encoding="utf-8")
+        code = data.decode("utf-8")
     except UnicodeDecodeError:
         return None
 
+    if cache.enabled():
+        digest = cache.content_digest(data)
+        cache.remember_stat(path_str, st.st_mtime_ns, st.st_size, digest)
+        key = cache.result_key(digest)
+        if (cached := cache.load(key)) is not None:
+            return _from_cache(cached, path)
+
+    # parse once and feed the same tree to every radon visitor
+    try:
+        tree = _parse(code, path_str)
+    except SyntaxError as exc:
+        # remember broken files too, so rescans don't parse them again
+        if key is not None:
+            cache.store(key, exc)
+        raise
     raw = analyze(code)
-    cc_results = cc_visit(code)
-    mi_value = mi_visit(code, multi=True)
+    cc_visitor = ComplexityVisitor.from_ast(tree)
+    mi_value = _mi_from_ast(tree, raw, cc_visitor.total_complexity)
     mi_r = mi_rank(mi_value)
 
-    grades: dict[str, int] = {}
+    grades: Counter[str] = Counter()
     worst_cc = 0
     worst_rank = "A"
 
-    for r in cc_results:
-        grade = cc_rank(r.complexity)
-        grades[grade] = grades.get(grade, 0) + 1
-        if r.complexity > worst_cc:
-            worst_cc = r.complexity
+    for r in cc_visitor.blocks:
+        cc = r.complexity
+        grade = _CC_RANKS[cc] if 0 <= cc < len(_CC_RANKS) else cc_rank(cc)
+        grades[grade] += 1
+        if cc > worst_cc:
+            worst_cc = cc
             worst_rank = grade
 
+    total_funcs, typed_funcs = count_typed_functions(tree)
+    # the tree and radon blocks are done with, release them before complexipy
+    # builds its own structures to keep peak memory per file down
+    del tree, cc_visitor
+
     # --- complexipy: file + per-function cognitive complexity ---
-    cx_result = file_complexity(str(path))
+    cx_result = code_complexity(code)
     file_cx = int(cx_result.complexity)
 
     fn_metrics: list[FunctionMetrics] = []
@@ -140,21 +390,21 @@ def analyze_file(path: Path) -> tuple[FileMetrics, list[FunctionMetrics]] | None
         max_func_cx = max(max_func_cx, c)
         fn_metrics.append(
             FunctionMetrics(
-                file=str(path),
+                file=path_str,
                 name=fn.name,
                 lineno=fn.line_start,
                 cognitive_complexity=c,
             )
         )
 
-    total_funcs, typed_funcs = count_typed_functions(code)
+    del cx_result
 
     file_metrics = FileMetrics(
-        path=str(path),
+        path=path_str,
         sloc=raw.sloc,
         lloc=raw.lloc,
         comments=raw.comments,
-        complexity_grades=grades,
+        complexity_grades=dict(grades),
         worst_cc=worst_cc,
         worst_cc_rank=worst_rank,
         mi=mi_value,
@@ -165,79 +415,263 @@ def analyze_file(path: Path) -> tuple[FileMetrics, list[FunctionMetrics]] | None
         max_function_cognitive_complexity=max_func_cx,
     )
 
+    if key is not None:
+        cache.store(key, (file_metrics, fn_metrics))
+
     return file_metrics, fn_metrics
 
 
-def walk_python_files(root: Path) -> list[Path]:
-    ignore_dirs = {
-        ".git",
-        ".venv",
-        "venv",
-        ".mypy_cache",
-        "__pycache__",
-        "build",
-        "dist",
-        ".tox",
-    }
-    paths: list[Path] = []
-    for p in root.rglob("*.py"):
-        if any(part in ignore_dirs for part in p.parts):
-            continue
-        paths.append(p)
-    return paths
+def _map_chunk(func: Callable[[Path], T], chunk: list[Path]) -> list[T]:
+    return [func(path) for path in chunk]
 
 
-def summarize(files: list[FileMetrics], root: Path) -> ProjectSummary:
-    total_sloc = 0
-    mi_values = []
-    total_functions = 0
-    typed_functions = 0
+def _chunked(paths: Iterator[Path], size: int) -> Iterator[list[Path]]:
+    while chunk := list(islice(paths, size)):
+        yield chunk
 
-    files_filtered = []
-    for f in files:
-        total_sloc += f.sloc
+
+def parallel_map(
+    func: Callable[[Path], T],
+    paths: Iterable[Path],
+    *,
+    jobs: int | None = None,
+    mp_context: BaseContext | None = None,
+) -> Iterator[T]:
+    """Yield func(path) for each path, in order, using a process pool.
+
+    func must be a picklable (module level) function. Only a bounded window
+    of chunks is submitted ahead of the consumer, so paths can be lazy and
+    results are not buffered up for the whole project. Small inputs, or
+    jobs=1, run in the current process to avoid the pool startup cost.
+    Closing the generator early drops the chunks that haven't started.
+    mp_context picks the start method (callers with threads running should
+    avoid fork).
+    """
+    workers = jobs or os.cpu_count() or 1
+    if isinstance(paths, Sized):
+        # spread a known amount of work over every worker
+        chunk_size = max(1, len(paths) // (PARALLEL_WINDOW * workers))
+    else:
+        chunk_size = PARALLEL_CHUNK_SIZE
+    it = iter(paths)
+    head = list(islice(it, PARALLEL_MIN_FILES))
+    if workers == 1 or len(head) < PARALLEL_MIN_FILES:
+        yield from map(func, chain(head, it))
+        return
+
+    chunks = _chunked(chain(head, it), chunk_size)
+    ex = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=cache.configure,
+        initargs=(cache.cache_dir(),),
+    )
+    try:
+        in_flight = deque(
+            ex.submit(_map_chunk, func, chunk)
+            for chunk in islice(chunks, workers * PARALLEL_WINDOW)
+        )
+        while in_flight:
+            results = in_flight.popleft().result()
+            for chunk in islice(chunks, 1):
+                in_flight.append(ex.submit(_map_chunk, func, chunk))
+            yield from results
+    finally:
+        ex.shutdown(cancel_futures=True)
+
+
+def _analyze_or_skip(path: Path) -> tuple[FileMetrics, list[FunctionMetrics]] | None:
+    """Analyze one file, returning None for files radon can't parse."""
+    try:
+        return analyze_file(path)
+    except SyntaxError:
+        # Skip files radon can't parse (or optionally log them somewhere)
+        return None
+
+
+def iter_analyze_files(
+    paths: Iterable[Path], *, jobs: int | None = None
+) -> Iterator[tuple[FileMetrics, list[FunctionMetrics]]]:
+    """Yield analysis results, fanning out to a process pool for larger projects.
+
+    Results keep the order of ``paths``; unreadable and unparsable files
+    are left out.
+    """
+    results = parallel_map(_analyze_or_skip, paths, jobs=jobs)
+    yield from (r for r in results if r is not None)
+
+
+def analyze_files(
+    paths: Iterable[Path], *, jobs: int | None = None
+) -> list[tuple[FileMetrics, list[FunctionMetrics]]]:
+    """List version of `iter_analyze_files`."""
+    return list(iter_analyze_files(paths, jobs=jobs))
+
+
+def _scan_dir(directory: str) -> tuple[list[str], list[str]]:
+    """Return (python_files, subdirs) for one directory level."""
+    files: list[str] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                # DirEntry caches the d_type from readdir, so no extra stat calls
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORE_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    files.append(entry.path)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def walk_python_files(root: Path) -> list[Path]:
+    """Find Python files under root, scanning directories on a thread pool.
+
+    Listing directories is latency bound (especially on network filesystems),
+    so several directories are read concurrently.
+    """
+    paths: list[Path] = []
+    with ThreadPoolExecutor(max_workers=WALK_THREADS) as ex:
+        pending = {ex.submit(_scan_dir, str(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                paths.extend(map(Path, files))
+                pending.update(ex.submit(_scan_dir, d) for d in subdirs)
+    return sorted(paths)
+
+
+class SummaryAccumulator:
+    """Build a ProjectSummary one file at a time, keeping only running totals."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.total_sloc = 0
+        self.mi_total = 0.0
+        self.mi_count = 0
+        self.files_scanned = 0
+        self.total_functions = 0
+        self.typed_functions = 0
+        self.low_mi_files = 0
+        self.grade_counts: Counter[str] = Counter()
+        self.cx_total = 0
+        self.max_cx = 0
+        self.skipped_files = 0
+
+    def skip(self) -> None:
+        """Count a file that was left out of the metrics."""
+        self.skipped_files += 1
+
+    def add(self, f: FileMetrics) -> None:
+        self.total_sloc += f.sloc
         if f.mi > 0:
-            mi_values.append(f.mi)
-        if "/tests/" not in f.path:
-            files_filtered.append(f)
-            total_functions += f.total_functions
-            typed_functions += f.typed_functions
-
-    low_mi_files = 0
-    high_cc = 0
-    grade_counts: dict[str, int] = {}
-    cx_values = []
-
-    for f in files_filtered:
+            self.mi_total += f.mi
+            self.mi_count += 1
+        if f.is_test:
+            return
+
+        self.files_scanned += 1
+        self.total_functions += f.total_functions
+        self.typed_functions += f.typed_functions
         if f.mi < MI_LOW:
-            low_mi_files += 1
-        cx_values.append(f.cognitive_complexity)
-        for grade, count in f.complexity_grades.items():
-            grade_counts[grade] = grade_counts.get(grade, 0) + count
-            if grade in ("D", "E", "F"):
-                high_cc += count
-
-    typing_coverage = (
-        typed_functions / total_functions * 100 if total_functions else 0.0
-    )
-    avg_cx = mean(cx_values) if cx_values else 0.0
-    max_cx = max(cx_values) if cx_values else 0
-
-    return ProjectSummary(
-        root=str(root),
-        files_scanned=len(files_filtered),
-        total_sloc=total_sloc,
-        avg_sloc_per_file=total_sloc / len(files_filtered) if files_filtered else 0.0,
-        avg_mi=mean(mi_values) if mi_values else 0.0,
-        low_mi_files=low_mi_files,
-        high_complexity_functions=high_cc,
-        cc_grade_counts=grade_counts,
-        total_functions=total_functions,
-        typed_functions=typed_functions,
-        typing_coverage=typing_coverage,
-        avg_cognitive_complexity=avg_cx,
-        max_cognitive_complexity=max_cx,
-    )
+            self.low_mi_files += 1
+        self.cx_total += f.cognitive_complexity
+        self.max_cx = max(self.max_cx, f.cognitive_complexity)
+        self.grade_counts.update(f.complexity_grades)
+
+    def finalize(self) -> ProjectSummary:
+        n = self.files_scanned
+        grades = self.grade_counts
+        typing_coverage = (
+            self.typed_functions / self.total_functions * 100
+            if self.total_functions
+            else 0.0
+        )
+        return ProjectSummary(
+            root=str(self.root),
+            files_scanned=n,
+            total_sloc=self.total_sloc,
+            avg_sloc_per_file=self.total_sloc / n if n else 0.0,
+            avg_mi=self.mi_total / self.mi_count if self.mi_count else 0.0,
+            low_mi_files=self.low_mi_files,
+            high_complexity_functions=grades["D"] + grades["E"] + grades["F"],
+            cc_grade_counts=dict(grades),
+            total_functions=self.total_functions,
+            typed_functions=self.typed_functions,
+            typing_coverage=typing_coverage,
+            avg_cognitive_complexity=self.cx_total / n if n else 0.0,
+            max_cognitive_complexity=self.max_cx,
+            skipped_files=self.skipped_files,
+        )
+
+
+def summarize(files: Iterable[FileMetrics], root: Path) -> ProjectSummary:
+    acc = SummaryAccumulator(root)
+    for f in files:
+        acc.add(f)
+    return acc.finalize()
+
+
+class Hotspots:
+    """Track the top_n lowest-MI (non-test) files and most complex functions.
+
+    Bounded heaps keep memory at O(top_n) however many results stream by;
+    ties keep the earliest result, like heapq.nsmallest/nlargest.
+    """
+
+    def __init__(self, top_n: int = 5) -> None:
+        self.top_n = top_n
+        self._seen = 0
+        # max-heap on MI (negated) so the best of the worst is popped first
+        self._files: list[tuple[float, int, FileMetrics]] = []
+        self._functions: list[tuple[int, int, FunctionMetrics]] = []
+
+    def _push(self, heap: list, item: tuple) -> None:
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def add(self, f: FileMetrics, fns: Iterable[FunctionMetrics] = ()) -> None:
+        if self.top_n <= 0:
+            return
+        if not f.is_test:
+            self._seen += 1
+            self._push(self._files, (-f.mi, -self._seen, f))
+        for fn in fns:
+            self._seen += 1
+            self._push(self._functions, (fn.cognitive_complexity, -self._seen, fn))
+
+    @property
+    def worst_files(self) -> list[FileMetrics]:
+        return [f for *_, f in sorted(self._files, reverse=True)]
+
+    @property
+    def worst_functions(self) -> list[FunctionMetrics]:
+        return [fn for *_, fn in sorted(self._functions, reverse=True)]
+
+
+def make_relativizer(root: Path | None) -> Callable[[str], str]:
+    """Return a function that strips the root prefix from path strings.
+
+    A plain string prefix check (no Path objects, no ValueError for paths
+    outside root, which are returned unchanged).
+    """
+    if root is None:
+        return str
+
+    prefix = str(root)
+    if not prefix.endswith(os.sep):
+        prefix += os.sep
+    cut = len(prefix)
+
+    def rel(p: str) -> str:
+        return p[cut:] if p.startswith(prefix) else p
+
+    return rel
 
 
 def print_hotspots(
@@ -250,32 +684,16 @@ def print_hotspots(
     top_n: int = 5,
     root: Path | None = None,
 ) -> None:
-    # Hoist rel out of the loop, don't construct Path repeatedly if root is None, cache result of rel if called for the same path multiple times
-    rel_cache: dict[str, str] = {}
-    if root is not None:
-
-        def rel(p: str) -> str:
-            if p in rel_cache:
-                return rel_cache[p]
-            try:
-                r = str(Path(p).relative_to(root))
-            except ValueError:
-                r = p
-            rel_cache[p] = r
-            return r
-    else:
-
-        def rel(p: str) -> str:
-            return p
-
-    print(
+    rel = make_relativizer(root)
+    # collect the lines and write them in one go rather than print() per line
+    lines = [
         f"\nTop {top_n} lowest MI files "
         f"(MI < {mi_low_threshold} = watch, >= {mi_target} = high):"
-    )
+    ]
 
-    non_test_files = (f for f in files if "/tests/" not in f.path)
+    non_test_files = (f for f in files if not f.is_test)
     # using heapq for efficiency with partial sorting
-    worst_files = heapq.nsmallest(top_n, non_test_files, key=lambda f: f.mi)
+    worst_files = heapq.nsmallest(top_n, non_test_files, key=_MI_KEY)
     for f in worst_files:
         if f.mi < mi_low_threshold:
             label = "WATCH"
@@ -283,21 +701,43 @@ def print_hotspots(
             label = "GOOD"
         else:
             label = "OK"
-        print(f"  {f.mi:5.1f} [{label}]  {rel(f.path)}")
+        lines.append(f"  {f.mi:5.1f} [{label}]  {rel(f.path)}")
 
-    print(
+    lines.append(
         f"\nTop {top_n} most complex functions "
         f"(target cognitive complexity <= {cx_function_target}):"
     )
 
     # Use heapq.nlargest for partial sorting performance
-    worst_fns = heapq.nlargest(top_n, functions, key=lambda fn: fn.cognitive_complexity)
+    worst_fns = heapq.nlargest(top_n, functions, key=_CX_KEY)
     for fn in worst_fns:
         flag = "OVER" if fn.cognitive_complexity > cx_function_target else "OK"
-        print(
+        lines.append(
             f"  {fn.cognitive_complexity:3d} [{flag}]  {rel(fn.file)}:{fn.lineno}  {fn.name}"
         )
 
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+class _DataclassEncoder(json.JSONEncoder):
+    """Serialize dataclasses field by field, without asdict's deep copy."""
+
+    def default(self, o: object) -> object:
+        if is_dataclass(o) and not isinstance(o, type):
+            return {f.name: getattr(o, f.name) for f in fields(o)}
+        return super().default(o)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -326,6 +766,18 @@ def main() -> None:
         default=None,
         help="Fail if typing coverage (functions) is below this value",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-analyze every file instead of reusing cached results",
+    )
 
     args = parser.parse_args()
 
@@ -347,30 +799,39 @@ def main() -> None:
     if not root.exists():
         raise SystemExit(f"Path not found: {root}")
 
+    if args.no_cache:
+        cache.configure(None)
+    else:
+        cache.configure(cache.default_dir())
+        cache.prune()
+
     py_files = walk_python_files(root)
-    file_metrics: list[FileMetrics] = []
-    function_metrics: list[FunctionMetrics] = []
+    acc = SummaryAccumulator(root)
+    hotspots = Hotspots()
 
-    for path in py_files:
-        try:
-            result = analyze_file(path)
-            if result is None:
-                continue
-        except SyntaxError:
-            # Skip files radon can't parse (or optionally log them somewhere)
+    for result in parallel_map(_analyze_or_skip, py_files, jobs=args.jobs):
+        if result is None:
+            acc.skip()
             continue
         fm, fns = result
-        file_metrics.append(fm)
-        function_metrics.extend(fns)
+        acc.add(fm)
+        hotspots.add(fm, fns)
 
-    summary = summarize(file_metrics, root)
+    summary = acc.finalize()
 
     if args.json:
-        print(json.dumps(asdict(summary), indent=2))
+        # json.dump writes the encoder's chunks as they are produced
+        json.dump(summary, sys.stdout, cls=_DataclassEncoder, indent=2)
+        print()
         return
 
     print(f"Pybites maintainability snapshot for: {summary.root}")
     print(f"  Files scanned              : {summary.files_scanned}")
+    if summary.skipped_files:
+        print(
+            f"  Files skipped              : {summary.skipped_files} "
+            "(generated, oversized, not UTF-8 or unparsable)"
+        )
     print(f"  Total SLOC                 : {summary.total_sloc}")
     print(f"  Avg SLOC per file          : {summary.avg_sloc_per_file:.1f}")
     print(
@@ -394,7 +855,12 @@ def main() -> None:
     print(f"\n  Avg cognitive complexity   : {summary.avg_cognitive_complexity:.1f}")
     print(f"  Max cognitive complexity   : {summary.max_cognitive_complexity}")
 
-    print_hotspots(file_metrics, function_metrics, root=root)
+    print_hotspots(
+        hotspots.worst_files,
+        hotspots.worst_functions,
+        top_n=hotspots.top_n,
+        root=root,
+    )
 
     fail = False
     if summary.avg_mi < mi_threshold:
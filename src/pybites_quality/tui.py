@@ -5,15 +5,23 @@ Usage:
     pybites-quality-tui
 """
 
+import multiprocessing
+import os
+import shutil
 import subprocess
+import time
+from contextlib import closing
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 
 from decouple import config
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal
 from textual.events import Key
 from textual.screen import Screen
+from textual.timer import Timer
 from textual.widgets import (
     Button,
     DataTable,
@@ -23,71 +31,253 @@ from textual.widgets import (
     OptionList,
     Static,
 )
+from textual.worker import get_current_worker
 
+from pybites_quality import cache
 from pybites_quality.core import (
     COGNITIVE_COMPLEXITY_TARGET,
     MI_HIGH,
     MI_LOW,
     FileMetrics,
     FunctionMetrics,
+    Hotspots,
     ProjectSummary,
+    SummaryAccumulator,
     analyze_file,
-    summarize,
+    make_relativizer,
+    parallel_map,
     walk_python_files,
 )
 
 DEFAULT_CODE_REPO = config("DEFAULT_CODE_REPO", default="~/code")
 DEFAULT_EDITOR = config("DEFAULT_EDITOR", default="vim")
+# resolved once rather than searching PATH every time a function is opened
+_EDITOR_PATH = shutil.which(DEFAULT_EDITOR) or DEFAULT_EDITOR
+# seconds of typing pause before the repo picker refilters
+REPO_FILTER_DELAY = 0.1
+# seconds between partial result updates while a scan runs
+PROGRESS_INTERVAL = 0.2
+# scans run in a worker thread next to Textual's own threads, and forking a
+# multithreaded process can deadlock the child, so don't fork the pool
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# table cell markup, indexed by MI bucket (watch, ok, good) and by
+# "cognitive complexity over target" (False, True)
+_MI_LABELS = ("[bold red]WATCH[/]", "[yellow]OK[/]", "[green]GOOD[/]")
+_MI_FORMATS = ("[bold red]{:5.1f}[/]", "[yellow]{:5.1f}[/]", "[green]{:5.1f}[/]")
+_CX_FLAGS = ("OK", "[bold red]OVER[/]")
+_CX_FORMATS = ("{}", "[bold red]{}[/]")
+
+# summary panel templates, with the MI thresholds filled in once at import
+_SUMMARY_HEAD = (
+    "[b]Pybites maintainability snapshot[/b]\n"
+    "Root: {s.root}\n"
+    "Files scanned          : {s.files_scanned}\n"
+)
+_SUMMARY_SKIPPED = "Files skipped (syntax) : {count} ({paths})\n"
+_SUMMARY_SKIPPED_OTHER = (
+    "Files skipped (other)  : {count} (generated, oversized or not UTF-8)\n"
+)
+_SUMMARY_BODY = (
+    "Total SLOC             : {s.total_sloc}\n"
+    "Avg SLOC per file      : {s.avg_sloc_per_file:.1f}\n"
+    "Avg MI                 : {s.avg_mi:.1f} "
+    f"(<{MI_LOW:.0f}=watch, {MI_LOW:.0f}–{MI_HIGH:.0f}=moderate, >{MI_HIGH:.0f}=high)\n"
+    f"Low MI files (<{MI_LOW:.0f}) : {{s.low_mi_files}}\n"
+    "High-CC funcs (D/E/F)  : {s.high_complexity_functions}\n"
+)
+_SUMMARY_GRADES = "CC grades (all files)  : {grades}\n"
+_SUMMARY_TAIL = (
+    "Typing coverage        : {s.typing_coverage:.1f}% "
+    "({s.typed_functions}/{s.total_functions} funcs)\n"
+    "Avg cognitive compl.   : {s.avg_cognitive_complexity:.1f}\n"
+    "Max cognitive compl.   : {s.max_cognitive_complexity}\n"
+    "MI is a heuristic – use it to compare files and track trends, "
+    "not as an absolute judgement.\n"
+)
+
+
+def format_summary(summary: ProjectSummary, skipped: list[Path]) -> str:
+    """Render the summary panel text (Rich markup)."""
+    fields = {"s": summary}
+    parts = [_SUMMARY_HEAD.format_map(fields)]
+    if skipped:
+        paths = ", ".join(map(str, skipped))
+        parts.append(_SUMMARY_SKIPPED.format(count=len(skipped), paths=paths))
+    if other := summary.skipped_files - len(skipped):
+        parts.append(_SUMMARY_SKIPPED_OTHER.format(count=other))
+    parts.append(_SUMMARY_BODY.format_map(fields))
+    if summary.cc_grade_counts:
+        grades = ", ".join(
+            f"{grade}={summary.cc_grade_counts[grade]}"
+            for grade in sorted(summary.cc_grade_counts)
+        )
+        parts.append(_SUMMARY_GRADES.format(grades=grades))
+    parts.append(_SUMMARY_TAIL.format_map(fields))
+    return "".join(parts)
+
+
+def _safe_analyze(
+    path: Path,
+) -> tuple[FileMetrics, list[FunctionMetrics]] | SyntaxError | None:
+    """Pool worker: return the syntax error instead of raising it."""
+    try:
+        return analyze_file(path)
+    except SyntaxError as exc:
+        return exc
+
+
+ScanResult = tuple[ProjectSummary, list[FileMetrics], list[FunctionMetrics], list[Path]]
 
 
 def scan_project(
     root: Path,
-) -> tuple[ProjectSummary, list[FileMetrics], list[FunctionMetrics], list[Path]]:
-    """Reuse your existing logic to compute summary + hotspots."""
+    *,
+    jobs: int | None = None,
+    on_progress: Callable[[ScanResult], None] | None = None,
+    progress_interval: float = PROGRESS_INTERVAL,
+    should_stop: Callable[[], bool] | None = None,
+) -> ScanResult:
+    """Reuse your existing logic to compute summary + hotspots.
+
+    Files are analyzed in a process pool; pass jobs=1 to stay in-process.
+    on_progress, if given, gets the results so far at most once every
+    progress_interval seconds while the scan runs. Once should_stop returns
+    True the scan ends early, dropping the files not analyzed yet.
+    """
     py_files = walk_python_files(root)
-    file_metrics: list[FileMetrics] = []
-    fn_metrics: list[FunctionMetrics] = []
+    # streaming totals and bounded top-10 heaps, no per-file lists kept around
+    acc = SummaryAccumulator(root)
+    hotspots = Hotspots(top_n=10)
+    last_progress = time.monotonic()
 
     skipped = []
-    for path in py_files:
-        try:
-            result = analyze_file(path)
-        except SyntaxError:
-            # Skip files radon can't parse (or optionally log them somewhere)
-            skipped.append(path)
-            continue
+    results = parallel_map(_safe_analyze, py_files, jobs=jobs, mp_context=_POOL_CONTEXT)
+    # closing the generator shuts the pool down without the pending chunks
+    with closing(results):
+        for path, result in zip(py_files, results):
+            if should_stop is not None and should_stop():
+                break
+            if isinstance(result, SyntaxError):
+                # Skip files radon can't parse (or optionally log them somewhere)
+                skipped.append(path)
+                acc.skip()
+                continue
+
+            if result is None:
+                acc.skip()
+                continue
+
+            fm, fns = result
+            acc.add(fm)
+            hotspots.add(fm, fns)
+
+            if on_progress is not None:
+                now = time.monotonic()
+                if now - last_progress >= progress_interval:
+                    last_progress = now
+                    on_progress(
+                        (
+                            acc.finalize(),
+                            hotspots.worst_files,
+                            hotspots.worst_functions,
+                            list(skipped),
+                        )
+                    )
+
+    return acc.finalize(), hotspots.worst_files, hotspots.worst_functions, skipped
+
+
+# base_dir -> (mtime_ns, {subdir: mtime_ns}, repos) so reopening the picker
+# doesn't rescan
+_repos_cache: dict[Path, tuple[int, dict[str, int], list[Path]]] = {}
+
+
+REPO_MARKERS = frozenset({"pyproject.toml", "setup.cfg", "setup.py", ".git"})
+# a virtualenv or node_modules dir can hold a setup.py, it isn't a repo; the
+# walker's IGNORE_DIRS is too broad here, a project may well be called build
+REPO_IGNORE_DIRS = frozenset(
+    {".venv", "venv", "site-packages", "node_modules", "__pycache__"}
+)
 
-        if result is None:
-            continue
 
-        fm, fns = result
-        file_metrics.append(fm)
-        fn_metrics.extend(fns)
+def _has_marker(directory: str) -> bool:
+    """List directory once, stopping at the first marker (vs a stat per marker)."""
+    try:
+        with os.scandir(directory) as it:
+            return any(sub.name in REPO_MARKERS for sub in it)
+    except OSError:
+        return False
+
 
-    summary = summarize(file_metrics, root)
+def _scan_repos(base_dir: Path) -> tuple[dict[str, int], list[Path]]:
+    """Return the mtimes of the candidate directories and the repos among them."""
+    with os.scandir(base_dir) as it:
+        entries = sorted(it, key=attrgetter("name"))
+    subdirs: dict[str, int] = {}
+    repos: list[Path] = []
+    for entry in entries:
+        if entry.name in REPO_IGNORE_DIRS or not entry.is_dir():
+            continue
+        try:
+            subdirs[entry.path] = entry.stat().st_mtime_ns
+        except OSError:
+            continue
+        if _has_marker(entry.path):
+            repos.append(Path(entry.path))
+    return subdirs, repos
 
-    # TODO: do this test mod filter in one place (in quality.py)
-    files = [f for f in file_metrics if "/tests/" not in f.path]
-    worst_files = sorted(files, key=lambda f: f.mi)[:10]
-    worst_fns = sorted(
-        fn_metrics, key=lambda fn: fn.cognitive_complexity, reverse=True
-    )[:10]
 
-    return summary, worst_files, worst_fns, skipped
+def _unchanged(subdirs: dict[str, int]) -> bool:
+    # adding or removing a marker (git init, a new pyproject.toml) bumps the
+    # mtime of the directory it's in; a stat each is cheaper than a listing
+    try:
+        return all(os.stat(path).st_mtime_ns == m for path, m in subdirs.items())
+    except OSError:
+        return False
 
 
-def find_repos(base_dir: Path) -> Iterable[Path]:
-    """Yield directories under base_dir that look like Python projects."""
-    markers = {"pyproject.toml", "setup.cfg", "setup.py", ".git"}
+def find_repos(base_dir: Path) -> list[Path]:
+    """Return directories under base_dir that look like Python projects.
+
+    Results are reused until the mtime of base_dir or of one of the
+    directories directly under it changes, i.e. until a directory is added,
+    removed or renamed, or a repo marker appears or goes away.
+    """
     if not base_dir.is_dir():
         raise FileNotFoundError(
             f"Base directory '{base_dir}' does not exist or is not a directory."
         )
-    for entry in sorted(base_dir.iterdir()):
-        if not entry.is_dir():
-            continue
-        if any((entry / m).exists() for m in markers):
-            yield entry
+    mtime = base_dir.stat().st_mtime_ns
+    cached = _repos_cache.get(base_dir)
+    if cached is None or cached[0] != mtime or not _unchanged(cached[1]):
+        cached = (mtime, *_scan_repos(base_dir))
+        _repos_cache[base_dir] = cached
+    return list(cached[2])
+
+
+def match_repo_names(
+    names: list[str], query: str, candidates: Iterable[int] | None = None
+) -> list[int]:
+    """Return indices of lowercased names containing query, prefix matches first.
+
+    One pass over the names, or only over candidates (ascending indices, e.g.
+    the previous hits when the query grew); each group keeps the input order.
+    """
+    indices = range(len(names)) if candidates is None else candidates
+    if not query:
+        return list(indices)
+    prefix: list[int] = []
+    contains: list[int] = []
+    for i in indices:
+        name = names[i]
+        if name.startswith(query):
+            prefix.append(i)
+        elif query in name:
+            contains.append(i)
+    return prefix + contains
 
 
 class QualityApp(App):
@@ -144,6 +334,7 @@ class QualityApp(App):
     def on_mount(self) -> None:
         self._setup_tables()
         self.current_root = Path(".")
+        self.current_files: list[FileMetrics] = []
         self.current_functions: list[FunctionMetrics] = []
         self._run_scan(Path("."))
 
@@ -157,76 +348,78 @@ class QualityApp(App):
     def _run_scan(self, root: Path) -> None:
         self.current_root = root
         self.summary_box.update(f"Scanning {root} ...")
-
-        summary, worst_files, worst_fns, skipped = scan_project(root)
-        self.current_functions = worst_fns
-
-        summary_text = (
-            f"[b]Pybites maintainability snapshot[/b]\n"
-            f"Root: {summary.root}\n"
-            f"Files scanned          : {summary.files_scanned}\n"
-        )
-        if skipped:
-            summary_text += (
-                "Files skipped (syntax) : "
-                f"{len(skipped)} ({', '.join(str(p) for p in skipped)})\n"
-            )
-        summary_text += (
-            f"Total SLOC             : {summary.total_sloc}\n"
-            f"Avg SLOC per file      : {summary.avg_sloc_per_file:.1f}\n"
-            f"Avg MI                 : {summary.avg_mi:.1f} "
-            f"(<{MI_LOW:.0f}=watch, {MI_LOW:.0f}–{MI_HIGH:.0f}=moderate, >{MI_HIGH:.0f}=high)\n"
-            f"Low MI files (<{MI_LOW:.0f}) : {summary.low_mi_files}\n"
-            f"High-CC funcs (D/E/F)  : {summary.high_complexity_functions}\n"
-        )
-
-        if summary.cc_grade_counts:
-            grades = ", ".join(
-                f"{grade}={summary.cc_grade_counts[grade]}"
-                for grade in sorted(summary.cc_grade_counts)
-            )
-            summary_text += f"CC grades (all files)  : {grades}\n"
-
-        summary_text += (
-            f"Typing coverage        : {summary.typing_coverage:.1f}% "
-            f"({summary.typed_functions}/{summary.total_functions} funcs)\n"
-            f"Avg cognitive compl.   : {summary.avg_cognitive_complexity:.1f}\n"
-            f"Max cognitive compl.   : {summary.max_cognitive_complexity}\n"
-            "MI is a heuristic – use it to compare files and track trends, "
-            "not as an absolute judgement.\n"
+        self._scan_in_background(root)
+
+    @work(thread=True, exclusive=True, group="scan")
+    def _scan_in_background(self, root: Path) -> None:
+        """Scan off the event loop; a newer scan cancels this one.
+
+        The tables fill in with the worst offenders so far while it runs.
+        """
+        worker = get_current_worker()
+
+        def show_partial(partial: ScanResult) -> None:
+            if not worker.is_cancelled:
+                self.call_from_thread(
+                    self._render_results, root, *partial, scanning=True
+                )
+
+        results = scan_project(
+            root,
+            on_progress=show_partial,
+            should_stop=lambda: worker.is_cancelled,
         )
+        if not worker.is_cancelled:
+            self.call_from_thread(self._render_results, root, *results)
+
+    def _render_results(
+        self,
+        root: Path,
+        summary: ProjectSummary,
+        worst_files: list[FileMetrics],
+        worst_fns: list[FunctionMetrics],
+        skipped: list[Path],
+        scanning: bool = False,
+    ) -> None:
+        summary_text = format_summary(summary, skipped)
+        if scanning:
+            summary_text = f"Scanning {root} ...\n{summary_text}"
         self.summary_box.update(summary_text)
 
-        # files table
-        self.files_table.clear()
+        # partial results arrive every PROGRESS_INTERVAL while scanning; leave
+        # the tables (and the cursor in them) alone unless the top 10 changed
+        if worst_files == self.current_files and worst_fns == self.current_functions:
+            return
+        self.current_files = worst_files
+        self.current_functions = worst_fns
 
+        rel = make_relativizer(root)
+
+        file_rows = []
         for f in worst_files:
-            if f.mi < MI_LOW:
-                label = "[bold red]WATCH[/]"
-                mi_text = f"[bold red]{f.mi:5.1f}[/]"
-            elif f.mi >= MI_HIGH:
-                label = "[green]GOOD[/]"
-                mi_text = f"[green]{f.mi:5.1f}[/]"
-            else:
-                label = "[yellow]OK[/]"
-                mi_text = f"[yellow]{f.mi:5.1f}[/]"
-
-            rel_path = str(Path(f.path).relative_to(root))
-            self.files_table.add_row(mi_text, label, rel_path)
-
-        # functions table
-        self.funcs_table.clear()
-        for fn in worst_fns:
-            if fn.cognitive_complexity > COGNITIVE_COMPLEXITY_TARGET:
-                flag = "[bold red]OVER[/]"
-                cx_text = f"[bold red]{fn.cognitive_complexity}[/]"
-            else:
-                flag = "OK"
-                cx_text = str(fn.cognitive_complexity)
+            # 0 = watch (< MI_LOW), 1 = ok, 2 = good (>= MI_HIGH)
+            bucket = (f.mi >= MI_LOW) + (f.mi >= MI_HIGH)
+            mi_text = _MI_FORMATS[bucket].format(f.mi)
+            file_rows.append((mi_text, _MI_LABELS[bucket], rel(f.path)))
 
-            rel_file = str(Path(fn.file).relative_to(root))
-            loc = f"{rel_file}:{fn.lineno}"
-            self.funcs_table.add_row(cx_text, flag, loc, fn.name)
+        fn_rows = []
+        for fn in worst_fns:
+            over = fn.cognitive_complexity > COGNITIVE_COMPLEXITY_TARGET
+            cx_text = _CX_FORMATS[over].format(fn.cognitive_complexity)
+            loc = f"{rel(fn.file)}:{fn.lineno}"
+            fn_rows.append((cx_text, _CX_FLAGS[over], loc, fn.name))
+
+        # refresh the screen once for all the table changes
+        with self.batch_update():
+            for table, rows in (
+                (self.files_table, file_rows),
+                (self.funcs_table, fn_rows),
+            ):
+                cursor = table.cursor_coordinate
+                table.clear()
+                table.add_rows(rows)
+                # clear() resets the cursor; put it back (clamped to the rows)
+                table.cursor_coordinate = cursor
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "scan-btn":
@@ -252,7 +445,7 @@ class QualityApp(App):
             line = fn.lineno
 
             with self.suspend():
-                subprocess.run([DEFAULT_EDITOR, f"+{line}", file])
+                subprocess.run([_EDITOR_PATH, f"+{line}", file], check=False)
 
     def action_pick_repo(self) -> None:
         base = Path(DEFAULT_CODE_REPO).expanduser()
@@ -270,46 +463,52 @@ class RepoPicker(Screen):
         super().__init__()
         self.base_dir = base_dir
         self._repos: list[Path] = []
+        self._labels: list[str] = []
+        self._names: list[str] = []
         self._matched: list[Path] = []
+        self._filter_timer: Timer | None = None
+        # last query and its hits in repo order, to narrow instead of rescan
+        self._last_query = ""
+        self._hits: list[int] = []
 
     def compose(self) -> ComposeResult:
         yield Input(placeholder="Filter repos…", id="repo-filter")
         yield OptionList(id="repo-list")
 
     def on_mount(self) -> None:
-        self._repos = list(find_repos(self.base_dir))
+        # already sorted by name; labels and their lowercased form are built
+        # once here rather than on every keystroke
+        self._repos = find_repos(self.base_dir)
+        self._labels = [p.name for p in self._repos]
+        self._names = [label.lower() for label in self._labels]
         self._refresh_list("")
 
         self.query_one("#repo-filter", Input).focus()
 
     def _refresh_list(self, query: str) -> None:
-        query = query.lower()
         ol = self.query_one("#repo-list", OptionList)
         ol.clear_options()
 
-        def score(p: Path) -> int:
-            name = p.name.lower()
-            if not query:
-                return 0
-            if name.startswith(query):
-                return 2
-            if query in name:
-                return 1
-            return 0
-
-        matched = sorted(self._repos, key=score, reverse=True)
-        if query:
-            matched = [p for p in matched if query in p.name.lower()]
+        query = query.lower()
+        # a longer query can only match a subset of the previous hits
+        narrowing = bool(self._last_query) and query.startswith(self._last_query)
+        order = match_repo_names(self._names, query, self._hits if narrowing else None)
+        self._last_query = query
+        self._hits = sorted(order)
 
         # keep the currently visible list so we can index into it later
-        self._matched = matched
-
-        for p in matched:
-            ol.add_option(p.name)
+        self._matched = [self._repos[i] for i in order]
+        ol.add_options([self._labels[i] for i in order])
 
     def on_input_changed(self, event: Input.Changed) -> None:
         if event.input.id == "repo-filter":
-            self._refresh_list(event.value)
+            # coalesce a burst of keystrokes into a single refresh
+            if self._filter_timer is not None:
+                self._filter_timer.stop()
+            query = event.value
+            self._filter_timer = self.set_timer(
+                REPO_FILTER_DELAY, lambda: self._refresh_list(query)
+            )
 
     def action_cancel(self) -> None:
         self.app.pop_screen()
@@ -331,6 +530,9 @@ class RepoPicker(Screen):
 
 def main() -> None:
     """Entry point for the TUI."""
+    # rescans only re-analyze files whose mtime or size changed
+    cache.configure(cache.default_dir())
+    cache.prune()
     QualityApp().run()
 
 
@@ -0,0 +1,13 @@
+import pytest
+
+from pybites_quality import cache
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch):
+    # main() enables the on-disk cache: point it away from $HOME, and don't
+    # let it leak into other tests
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("PYBITES_QUALITY_CACHE_DIR", str(cache_dir))
+    yield
+    cache.configure(None)
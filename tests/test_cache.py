@@ -0,0 +1,170 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from pybites_quality import cache, core
+
+
+def test_cache_disabled_by_default():
+    assert not cache.enabled()
+    cache.store("key", 42)
+    assert cache.load("key") is None
+
+
+def test_store_and_load_roundtrip(tmp_path: Path):
+    cache.configure(tmp_path)
+    assert cache.enabled()
+    assert cache.load("missing") is None
+
+    cache.store("key", {"a": 1})
+    assert cache.load("key") == {"a": 1}
+    assert (tmp_path / cache.DB_NAME).exists()
+
+
+def test_cache_usable_from_other_threads(tmp_path: Path):
+    # the TUI runs each rescan in a new worker thread
+    cache.configure(tmp_path)
+    cache.store("key", 1)
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(cache.load("key")))
+    worker.start()
+    worker.join()
+
+    assert seen == [1]
+
+
+def test_prune_drops_other_versions_and_caps_rows(tmp_path: Path):
+    cache.configure(tmp_path)
+    cache.store("abc:0:old-radon:old-complexipy", 1)
+    keys = [cache.result_key(f"digest{i}") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.store(key, i)
+    for i in range(3):
+        cache.remember_stat(f"/p/{i}.py", 1, 1, f"digest{i}")
+
+    cache.prune(max_entries=2)
+
+    assert cache.load("abc:0:old-radon:old-complexipy") is None
+    assert [cache.load(key) for key in keys] == [None, 1, 2]
+    assert cache.digest_for_stat("/p/0.py", 1, 1) is None
+    assert cache.digest_for_stat("/p/2.py", 1, 1) == "digest2"
+
+
+def test_result_key_depends_on_bytes_only():
+    def key(data: bytes) -> str:
+        return cache.result_key(cache.content_digest(data))
+
+    assert key(b"x = 1\n") == key(b"x = 1\n")
+    assert key(b"x = 1\n") != key(b"x = 2\n")
+
+
+def test_analyze_file_uses_cache(tmp_path: Path, monkeypatch):
+    cache.configure(tmp_path / "cache")
+    src = tmp_path / "mod.py"
+    src.write_text("def foo(x: int) -> int:\n    return x\n", encoding="utf-8")
+
+    first = core.analyze_file(src)
+    assert first is not None
+
+    # a hit must not re-run the analyzers
+    def boom(code):
+        raise AssertionError("analyzer called on cache hit")
+
+    monkeypatch.setattr(core, "code_complexity", boom)
+    assert core.analyze_file(src) == first
+
+
+def test_analyze_file_cache_hit_for_copy_keeps_own_path(tmp_path: Path):
+    cache.configure(tmp_path / "cache")
+    code = "def foo(x):\n    return x\n"
+    a = tmp_path / "a.py"
+    b = tmp_path / "b.py"
+    a.write_text(code, encoding="utf-8")
+    b.write_text(code, encoding="utf-8")
+
+    core.analyze_file(a)
+    result = core.analyze_file(b)
+
+    assert result is not None
+    fm, fns = result
+    assert fm.path == str(b)
+    assert all(fn.file == str(b) for fn in fns)
+
+
+def test_analyze_file_unchanged_stat_skips_reading(tmp_path: Path, monkeypatch):
+    cache.configure(tmp_path / "cache")
+    src = tmp_path / "mod.py"
+    src.write_text("def foo(x: int) -> int:\n    return x\n", encoding="utf-8")
+
+    first = core.analyze_file(src)
+
+    def no_read(path):
+        raise AssertionError("file read despite unchanged stat")
+
+    monkeypatch.setattr(core, "_read_bytes", no_read)
+    assert core.analyze_file(src) == first
+
+
+def test_analyze_file_changed_file_is_reanalyzed(tmp_path: Path):
+    cache.configure(tmp_path / "cache")
+    src = tmp_path / "mod.py"
+    src.write_text("def foo(x):\n    return x\n", encoding="utf-8")
+    first = core.analyze_file(src)
+
+    src.write_text("def foo(x: int) -> int:\n    return x\n", encoding="utf-8")
+    second = core.analyze_file(src)
+
+    assert first is not None and second is not None
+    assert first[0].typed_functions == 0
+    assert second[0].typed_functions == 1
+
+
+def test_analyze_file_caches_syntax_errors(tmp_path: Path, monkeypatch):
+    cache.configure(tmp_path / "cache")
+    bad = "def broken(:\n    pass\n"
+    a = tmp_path / "a.py"
+    b = tmp_path / "b.py"
+    a.write_text(bad, encoding="utf-8")
+    b.write_text(bad, encoding="utf-8")
+
+    with pytest.raises(SyntaxError) as first:
+        core.analyze_file(a)
+
+    def no_parse(code, filename):
+        raise AssertionError("parsed a file with a cached syntax error")
+
+    monkeypatch.setattr(core, "_parse", no_parse)
+    with pytest.raises(SyntaxError) as again:
+        core.analyze_file(a)
+    with pytest.raises(SyntaxError) as copy:
+        core.analyze_file(b)
+
+    assert again.value.lineno == first.value.lineno
+    assert again.value.filename == str(a)
+    assert copy.value.filename == str(b)
+
+
+def test_cached_syntax_error_not_reused_under_other_python(
+    tmp_path: Path, monkeypatch
+):
+    cache.configure(tmp_path / "cache")
+    src = tmp_path / "new_syntax.py"
+    src.write_text("def broken(:\n    pass\n", encoding="utf-8")
+    with pytest.raises(SyntaxError):
+        core.analyze_file(src)
+
+    parsed = []
+    real_parse = core._parse
+
+    def spy(code, filename):
+        parsed.append(filename)
+        return real_parse(code, filename)
+
+    monkeypatch.setattr(core, "_parse", spy)
+    monkeypatch.setattr(cache, "_tool_versions", lambda: "5:cpython-399:x:y")
+    with pytest.raises(SyntaxError):
+        core.analyze_file(src)
+
+    assert parsed == [str(src)]
@@ -1,5 +1,8 @@
+import ast
 import json
+import os
 import sys
+import time
 from pathlib import Path
 
 import pytest
@@ -178,6 +181,19 @@ def _fake_metrics_for_main(path: Path) -> tuple[FileMetrics, list[FunctionMetric
     return fm, fns
 
 
+@pytest.mark.parametrize("jobs", ["0", "-1", "two"])
+def test_main_rejects_bad_jobs(
+    jobs: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys
+):
+    monkeypatch.setattr(sys, "argv", ["pybites-quality", str(tmp_path), "-j", jobs])
+
+    with pytest.raises(SystemExit) as exc:
+        core.main()
+
+    assert exc.value.code == 2
+    assert "--jobs" in capsys.readouterr().err
+
+
 def test_main_passes_when_thresholds_met(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
 ):
@@ -394,3 +410,328 @@ def test_main_skips_files_where_analyze_file_returns_none(
 
     # Only one file should be counted
     assert "Files scanned              : 1" in out
+    assert "Files skipped              : 1 (generated" in out
+
+
+def test_analyze_files_parallel_matches_serial(tmp_path: Path):
+    paths = []
+    # enough files for several chunks per worker
+    for i in range(4 * core.PARALLEL_MIN_FILES):
+        path = tmp_path / f"mod_{i}.py"
+        path.write_text(f"def f{i}(x: int) -> int:\n    return x + {i}\n")
+        paths.append(path)
+    bad = tmp_path / "bad.py"
+    bad.write_text("def broken(:\n    pass\n")
+    paths.append(bad)
+
+    serial = core.analyze_files(paths, jobs=1)
+    parallel = core.analyze_files(paths, jobs=3)
+
+    assert len(serial) == len(paths) - 1
+    assert [fm.path for fm, _ in parallel] == [fm.path for fm, _ in serial]
+    assert [fns for _, fns in parallel] == [fns for _, fns in serial]
+
+
+def _slow_pid(path: Path) -> int:
+    time.sleep(0.02)
+    return os.getpid()
+
+
+def test_parallel_map_spreads_small_inputs_over_workers():
+    paths = [Path(f"f{i}.py") for i in range(12)]
+
+    pids = list(core.parallel_map(_slow_pid, paths, jobs=4))
+
+    assert len(pids) == 12
+    assert len(set(pids)) > 1
+
+
+def test_parallel_map_streams_lazy_input():
+    pulled = []
+
+    def paths():
+        for i in range(1000):
+            pulled.append(i)
+            yield Path(f"f{i}.py")
+
+    results = core.parallel_map(str, paths(), jobs=2)
+    assert next(results) == "f0.py"
+    # only the in-flight window has been read ahead, not the whole input
+    window = 2 * core.PARALLEL_WINDOW * core.PARALLEL_CHUNK_SIZE
+    assert len(pulled) <= window + core.PARALLEL_CHUNK_SIZE
+    assert list(results) == [f"f{i}.py" for i in range(1, 1000)]
+
+
+def test_walk_python_files_nested_and_sorted(tmp_path: Path):
+    deep = tmp_path / "a" / "b" / "c"
+    deep.mkdir(parents=True)
+    (deep / "z.py").write_text("")
+    (tmp_path / "a" / "y.py").write_text("")
+    (tmp_path / "x.py").write_text("")
+    build = tmp_path / "a" / "build"
+    build.mkdir()
+    (build / "generated.py").write_text("")
+
+    paths = walk_python_files(tmp_path)
+
+    assert paths == sorted(paths)
+    rel = [p.relative_to(tmp_path).as_posix() for p in paths]
+    assert rel == ["a/b/c/z.py", "a/y.py", "x.py"]
+
+
+def test_count_typed_functions_accepts_parsed_tree():
+    code = "def f(x: int) -> int:\n    return x\n\ndef g(y):\n    return y\n"
+    assert count_typed_functions(ast.parse(code)) == count_typed_functions(code)
+
+
+def test_analyze_file_mi_matches_radon(tmp_path: Path):
+    from radon.metrics import mi_visit
+
+    code = '"""Doc."""\n\n# comment\ndef foo(x):\n    if x:\n        return 1\n    return 2\n'
+    path = tmp_path / "mod.py"
+    path.write_text(code, encoding="utf-8")
+
+    result = core.analyze_file(path)
+    assert result is not None
+    fm, _ = result
+    assert fm.mi == pytest.approx(mi_visit(code, multi=True))
+
+
+def test_count_typed_functions_finds_nested_defs():
+    code = """
+class A:
+    def method(self) -> None:
+        def inner(x: int):
+            return x
+
+        if True:
+            def in_if():
+                pass
+
+try:
+    pass
+except ValueError:
+    def in_handler(): ...
+
+match 1:
+    case 1:
+        async def in_case(y: str): ...
+
+with open("f") as fh:
+    for line in fh:
+        def in_loop(): ...
+"""
+    assert count_typed_functions(code) == (6, 3)
+
+
+def test_summary_accumulator_matches_summarize(tmp_path: Path):
+    files = [
+        _make_fm(path="app/a.py", mi=35.0, complexity_grades={"A": 2, "D": 1}),
+        _make_fm(path="app/b.py", mi=80.0, cognitive_complexity=12),
+        _make_fm(path="app/tests/test_a.py", mi=20.0),
+    ]
+    acc = core.SummaryAccumulator(tmp_path)
+    for f in files:
+        acc.add(f)
+
+    summary = acc.finalize()
+    assert summary == summarize(files, tmp_path)
+    assert summary.files_scanned == 2
+    assert summary.high_complexity_functions == 1
+    assert summary.cc_grade_counts == {"A": 3, "D": 1}
+    assert summary.max_cognitive_complexity == 12
+
+
+def test_hotspots_match_full_sort():
+    files = [_make_fm(path=f"proj/f{i}.py", mi=float(i % 7)) for i in range(30)]
+    files.append(_make_fm(path="proj/tests/test_x.py", mi=-1.0))
+    fns = [
+        FunctionMetrics(
+            file="proj/x.py", name=f"fn{i}", lineno=i, cognitive_complexity=i % 5
+        )
+        for i in range(30)
+    ]
+
+    hotspots = core.Hotspots(top_n=5)
+    for i, f in enumerate(files):
+        hotspots.add(f, fns[i : i + 1])
+
+    non_test = [f for f in files if "/tests/" not in f.path]
+    assert hotspots.worst_files == sorted(non_test, key=lambda f: f.mi)[:5]
+    assert (
+        hotspots.worst_functions
+        == sorted(fns, key=lambda fn: fn.cognitive_complexity, reverse=True)[:5]
+    )
+
+
+def test_analyze_file_syntax_error_names_file(tmp_path: Path):
+    path = tmp_path / "bad.py"
+    path.write_text("def broken(:\n    pass\n", encoding="utf-8")
+
+    with pytest.raises(SyntaxError) as exc:
+        core.analyze_file(path)
+    assert exc.value.filename == str(path)
+
+
+def test_metrics_dataclasses_are_slotted_and_frozen():
+    import dataclasses
+
+    fm = _make_fm(path="app/a.py")
+    assert not hasattr(fm, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        fm.mi = 1.0  # type: ignore[misc]
+
+
+def test_analyze_file_skips_oversized_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(core, "MAX_FILE_SIZE", 100)
+    small = tmp_path / "small.py"
+    small.write_text("x = 1\n")
+    huge = tmp_path / "huge.py"
+    huge.write_text("x = 1\n" * 50)
+
+    assert core.analyze_file(small) is not None
+    assert core.analyze_file(huge) is None
+
+
+def test_main_counts_oversized_files_as_skipped(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys
+):
+    monkeypatch.setattr(core, "MAX_FILE_SIZE", 100)
+    (tmp_path / "small.py").write_text("x = 1\n")
+    (tmp_path / "huge.py").write_text("x = 1\n" * 50)
+    monkeypatch.setattr(core, "config", lambda name, default=None, cast=float: default)
+    # no functions means 0% typed, so drop the gates to keep main() from exiting
+    argv = [
+        "pybites-quality",
+        str(tmp_path),
+        "--fail-mi-below",
+        "0",
+        "--fail-typing-below",
+        "0",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    core.main()
+    out = capsys.readouterr().out
+
+    assert "Files scanned              : 1" in out
+    assert "Files skipped              : 1 (generated, oversized" in out
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "# Generated by Django 4.2 on 2024-01-01 12:00\n",
+        "# Generated by the protocol buffer compiler.  DO NOT EDIT!\n",
+        '"""@generated by some tool"""\n',
+    ],
+)
+def test_analyze_file_skips_generated_files(tmp_path: Path, header: str):
+    path = tmp_path / "gen.py"
+    path.write_text(header + "x = 1\n", encoding="utf-8")
+    assert core.analyze_file(path) is None
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        'PLUGINS = ["a", "b"]  # do not edit this list without a release note\n',
+        'import os\n\nHELP = """Generated by hand. DO NOT EDIT manually."""\n',
+        '"""Helpers."""\n\n\ndef f():\n    """@generated ids are stable."""\n',
+    ],
+)
+def test_analyze_file_keeps_markers_outside_header(tmp_path: Path, code: str):
+    path = tmp_path / "mod.py"
+    path.write_text(code, encoding="utf-8")
+    assert core.analyze_file(path) is not None
+
+
+def test_is_generated_reads_multiline_docstring_header():
+    data = b'#!/usr/bin/env python\n"""Client stubs.\n\nDO NOT EDIT.\n"""\nx = 1\n'
+    assert core.is_generated(data)
+
+
+def test_walk_python_files_prunes_ignored_dirs_during_descent(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    site = tmp_path / ".venv" / "lib" / "site-packages"
+    site.mkdir(parents=True)
+    (site / "dep.py").write_text("")
+    node_modules = tmp_path / "node_modules" / "pkg"
+    node_modules.mkdir(parents=True)
+    (node_modules / "gyp.py").write_text("")
+    (tmp_path / "app.py").write_text("")
+
+    scanned = []
+    real_scan_dir = core._scan_dir
+
+    def spy(directory):
+        scanned.append(directory)
+        return real_scan_dir(directory)
+
+    monkeypatch.setattr(core, "_scan_dir", spy)
+
+    walk_python_files(tmp_path)
+    assert scanned == [str(tmp_path)]
+
+
+def test_cc_rank_table_matches_radon():
+    from radon.complexity import cc_rank
+
+    assert core._CC_RANKS == tuple(cc_rank(i) for i in range(len(core._CC_RANKS)))
+
+
+def test_relativizer_prefix_rules():
+    rel = core.make_relativizer(Path("proj"))
+    assert rel("proj/pkg/a.py") == "pkg/a.py"
+    assert rel("proj2/a.py") == "proj2/a.py"  # sibling sharing the prefix
+    assert rel("/elsewhere/a.py") == "/elsewhere/a.py"
+
+    assert core.make_relativizer(Path("/"))("/abs/a.py") == "abs/a.py"
+    assert core.make_relativizer(None)("proj/a.py") == "proj/a.py"
+
+
+@pytest.mark.parametrize("content", ["", "\n\n  \n"])
+def test_analyze_file_blank_file_short_circuit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, content: str
+):
+    path = tmp_path / "__init__.py"
+    path.write_text(content, encoding="utf-8")
+
+    # blank files must not reach the parsers at all
+    def boom(*args, **kwargs):
+        raise AssertionError("parser called for blank file")
+
+    monkeypatch.setattr(core, "_parse", boom)
+    monkeypatch.setattr(core, "analyze", boom)
+    monkeypatch.setattr(core, "code_complexity", boom)
+
+    result = core.analyze_file(path)
+    assert result is not None
+    fm, fns = result
+    assert fm.path == str(path)
+    assert fm.sloc == 0
+    assert fm.mi == 100.0
+    assert fns == []
+
+
+def test_analyze_file_functions_share_path_string(tmp_path: Path):
+    path = tmp_path / "mod.py"
+    path.write_text("def a():\n    pass\n\ndef b():\n    pass\n", encoding="utf-8")
+
+    result = core.analyze_file(path)
+    assert result is not None
+    fm, fns = result
+    assert len(fns) == 2
+    assert all(fn.file is fm.path for fn in fns)
+
+
+def test_file_metrics_is_test_flag_follows_path():
+    import dataclasses
+
+    fm = _make_fm(path="app/tests/test_a.py")
+    assert fm.is_test
+    assert not _make_fm(path="app/a.py").is_test
+    assert not dataclasses.replace(fm, path="app/a.py").is_test
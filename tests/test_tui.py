@@ -1,8 +1,9 @@
+import os
 from pathlib import Path
 
 import pytest
 
-from pybites_quality import tui
+from pybites_quality import core, tui
 from pybites_quality.core import FileMetrics, FunctionMetrics
 
 
@@ -69,6 +70,24 @@ class TestFindRepos:
         assert len(repos) == 1
         assert repos[0] == repo
 
+    def test_find_repos_skips_ignored_dirs(self, tmp_path: Path):
+        venv = tmp_path / ".venv"
+        venv.mkdir()
+        (venv / "setup.py").touch()
+        repo = tmp_path / "real_repo"
+        repo.mkdir()
+        (repo / ".git").mkdir()
+
+        assert tui.find_repos(tmp_path) == [repo]
+
+    def test_find_repos_lists_repos_named_like_build_dirs(self, tmp_path: Path):
+        # IGNORE_DIRS applies inside a project, not to the projects themselves
+        repo = tmp_path / "build"
+        repo.mkdir()
+        (repo / ".git").mkdir()
+
+        assert tui.find_repos(tmp_path) == [repo]
+
     def test_find_repos_with_git(self, tmp_path: Path):
         repo = tmp_path / "git_repo"
         repo.mkdir()
@@ -138,14 +157,131 @@ class TestFindRepos:
             list(tui.find_repos(file_path))
         assert "does not exist or is not a directory" in str(exc.value)
 
+    def test_find_repos_memoized_until_base_dir_changes(self, tmp_path: Path):
+        repo1 = tmp_path / "alpha_repo"
+        repo1.mkdir()
+        (repo1 / "pyproject.toml").touch()
+        assert tui.find_repos(tmp_path) == [repo1]
+
+        # same mtime: cached result, the new repo isn't seen yet
+        st = tmp_path.stat()
+        repo2 = tmp_path / "beta_repo"
+        repo2.mkdir()
+        (repo2 / "setup.py").touch()
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert tui.find_repos(tmp_path) == [repo1]
+
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert tui.find_repos(tmp_path) == [repo1, repo2]
+
+    def test_find_repos_sees_marker_added_to_existing_dir(self, tmp_path: Path):
+        repo = tmp_path / "later_repo"
+        repo.mkdir()
+        assert tui.find_repos(tmp_path) == []
+
+        # base dir mtime is unchanged, the subdirectory's isn't
+        st = repo.stat()
+        (repo / ".git").mkdir()
+        os.utime(repo, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert tui.find_repos(tmp_path) == [repo]
+
+
+def test_format_summary_lines(tmp_path: Path):
+    fm, _ = _fake_metrics(tmp_path / "app.py")
+    summary = core.summarize([fm], tmp_path)
+
+    text = tui.format_summary(summary, [tmp_path / "bad.py"])
+
+    assert f"Root: {tmp_path}\n" in text
+    assert f"Files skipped (syntax) : 1 ({tmp_path / 'bad.py'})\n" in text
+    assert "Avg MI                 : 70.0 (<40=watch, 40–70=moderate" in text
+    assert "CC grades (all files)  : A=1\n" in text
+    assert "Typing coverage        : 100.0% (2/2 funcs)\n" in text
+    assert "Files skipped" not in tui.format_summary(summary, [])
+
+
+def test_format_summary_counts_other_skipped_files(tmp_path: Path):
+    fm, _ = _fake_metrics(tmp_path / "app.py")
+    acc = core.SummaryAccumulator(tmp_path)
+    acc.add(fm)
+    for _ in range(3):
+        acc.skip()
+
+    text = tui.format_summary(acc.finalize(), [tmp_path / "bad.py"])
+
+    assert "Files skipped (syntax) : 1" in text
+    assert "Files skipped (other)  : 2 (generated, oversized or not UTF-8)\n" in text
+
+
+def test_match_repo_names_prefix_matches_first():
+    names = ["my-api", "api", "tools", "rapid", "api-client"]
+
+    assert tui.match_repo_names(names, "") == [0, 1, 2, 3, 4]
+    assert tui.match_repo_names(names, "api") == [1, 4, 0, 3]
+    assert tui.match_repo_names(names, "xyz") == []
+
+
+def test_match_repo_names_narrowing_matches_full_scan():
+    names = ["my-api", "api", "tools", "rapid", "api-client", "apix"]
+    hits = sorted(tui.match_repo_names(names, "ap"))
+
+    for query in ("api", "api-", "apix"):
+        narrowed = tui.match_repo_names(names, query, hits)
+        assert narrowed == tui.match_repo_names(names, query)
+
 
 class TestScanProject:
+    def test_scan_project_parallel_real_files(self, tmp_path: Path):
+        # enough files for several chunks per worker
+        n_files = 4 * core.PARALLEL_MIN_FILES
+        for i in range(n_files):
+            (tmp_path / f"mod_{i}.py").write_text(
+                f"def f{i}(x: int) -> int:\n    return x\n"
+            )
+        bad = tmp_path / "bad.py"
+        bad.write_text("def broken(:\n    pass\n")
+
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=2)
+
+        assert skipped == [bad]
+        assert summary.files_scanned == n_files
+        assert len(worst_fns) == 10
+
+        serial = tui.scan_project(tmp_path, jobs=1)
+        assert serial == (summary, worst_files, worst_fns, skipped)
+
+    def test_scan_project_stops_when_asked(self, tmp_path: Path):
+        for i in range(5):
+            (tmp_path / f"mod_{i}.py").write_text(f"def f{i}(x):\n    return x\n")
+
+        checks = []
+
+        def should_stop() -> bool:
+            checks.append(1)
+            return len(checks) > 2
+
+        summary, *_ = tui.scan_project(tmp_path, jobs=1, should_stop=should_stop)
+
+        assert summary.files_scanned == 2
+
+    def test_scan_project_reports_progress(self, tmp_path: Path):
+        for i in range(3):
+            (tmp_path / f"mod_{i}.py").write_text(f"def f{i}(x):\n    return x\n")
+
+        partials = []
+        result = tui.scan_project(
+            tmp_path, jobs=1, on_progress=partials.append, progress_interval=0
+        )
+
+        assert [p[0].files_scanned for p in partials] == [1, 2, 3]
+        assert partials[-1] == result
+
     def test_scan_project_basic(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
         # Create a simple project structure
         monkeypatch.setattr(tui, "walk_python_files", lambda r: [tmp_path / "app.py"])
         monkeypatch.setattr(tui, "analyze_file", _fake_metrics)
 
-        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path)
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=1)
 
         assert summary.files_scanned == 1
         assert summary.total_sloc == 20
@@ -178,7 +314,7 @@ class TestScanProject:
         monkeypatch.setattr(tui, "walk_python_files", fake_walk)
         monkeypatch.setattr(tui, "analyze_file", fake_analyze)
 
-        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path)
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=1)
 
         # Test files should be excluded from worst_files
         assert len(worst_files) == 1
@@ -201,7 +337,7 @@ class TestScanProject:
         monkeypatch.setattr(tui, "walk_python_files", fake_walk)
         monkeypatch.setattr(tui, "analyze_file", fake_analyze)
 
-        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path)
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=1)
 
         assert len(skipped) == 1
         assert skipped[0] == bad_file
@@ -224,7 +360,7 @@ class TestScanProject:
         monkeypatch.setattr(tui, "walk_python_files", fake_walk)
         monkeypatch.setattr(tui, "analyze_file", fake_analyze)
 
-        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path)
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=1)
 
         # File returning None is not in skipped (only SyntaxError goes there)
         assert len(skipped) == 0
@@ -253,7 +389,7 @@ class TestScanProject:
         monkeypatch.setattr(tui, "walk_python_files", fake_walk)
         monkeypatch.setattr(tui, "analyze_file", fake_analyze)
 
-        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path)
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=1)
 
         # Should be limited to 10 worst
         assert len(worst_files) <= 10
@@ -276,7 +412,7 @@ class TestScanProject:
         monkeypatch.setattr(tui, "walk_python_files", fake_walk)
         monkeypatch.setattr(tui, "analyze_file", fake_analyze)
 
-        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path)
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=1)
 
         # worst_files should be sorted by MI ascending (worst first)
         mi_values = [f.mi for f in worst_files]
@@ -306,7 +442,7 @@ class TestScanProject:
         monkeypatch.setattr(tui, "walk_python_files", fake_walk)
         monkeypatch.setattr(tui, "analyze_file", fake_analyze)
 
-        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path)
+        summary, worst_files, worst_fns, skipped = tui.scan_project(tmp_path, jobs=1)
 
         # worst_fns should be sorted by complexity descending (worst first)
         complexities = [fn.cognitive_complexity for fn in worst_fns]